@@ -14,12 +14,14 @@ COLOR_ALLOCATED_MEMORY = "#1464A0"  # Blue for allocated memory
 COLOR_TEXT = "#FFFFFF"  # White text
 COLOR_HIGHLIGHT = "#FFB900"  # Amber for highlights
 
-# Allocation algorithms
-ALGORITHMS = ['First Fit', 'Best Fit', 'Worst Fit']
+# Allocation algorithms (the full list is MemoryManager.ALLOCATION_ALGORITHMS)
 DEFAULT_ALGORITHM = 'First Fit'
 
 # Visualization settings
 MEMORY_RECT_HEIGHT = 100
 MEMORY_RECT_WIDTH = 1100
 MEMORY_RECT_X = 50
-MEMORY_RECT_Y = 50
\ No newline at end of file
+MEMORY_RECT_Y = 50
+BLOCK_LABEL_MIN_WIDTH = 20  # in px, narrower blocks are drawn without a label
+REDRAW_FPS = 60  # Upper bound on redraws; frames are skipped while memory is unchanged
+GRAPH_UPDATE_INTERVAL = 10  # in seconds, between usage history samples
\ No newline at end of file
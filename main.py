@@ -1,12 +1,15 @@
+import os
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, 
                              QLineEdit, QLabel, QComboBox, QInputDialog, QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt, QTimer
-from memory_manager.memory import MemoryManager
+from memory_manager.memory import MemoryManager, MIN_PROCESS_ID, MAX_PROCESS_ID
 from visualization.visualization import MemoryVisualization
 from utils.metrics import MetricsTracker
 import config
 import json
+import zipfile
+import numpy as np
 
 class MemoryVisualizerApp(QMainWindow):
     def __init__(self):
@@ -19,15 +22,13 @@ class MemoryVisualizerApp(QMainWindow):
 
         self.init_ui()
 
-        # Timer for continuous updates (30 FPS)
+        # Single timer: redraws when the memory manager's version changed, graph sample every N ticks
+        self._last_version = -1
+        self._tick = 0
+        self._graph_ticks = config.GRAPH_UPDATE_INTERVAL * config.REDRAW_FPS
         self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_visualization)
-        self.update_timer.start(1000 // 30)  # 30 FPS
-
-        # Timer for graph updates (every 10 seconds)
-        self.graph_timer = QTimer(self)
-        self.graph_timer.timeout.connect(self.update_graph)
-        self.graph_timer.start(10000)
+        self.update_timer.timeout.connect(self.on_tick)
+        self.update_timer.start(1000 // config.REDRAW_FPS)
 
     def init_ui(self):
         central_widget = QWidget()
@@ -56,13 +57,13 @@ class MemoryVisualizerApp(QMainWindow):
         controls_layout.addWidget(deallocate_button)
 
         self.algorithm_combo = QComboBox()
-        self.algorithm_combo.addItems(["First Fit", "Best Fit", "Worst Fit", "Next Fit"])
+        self.algorithm_combo.addItems(MemoryManager.ALLOCATION_ALGORITHMS)
         self.algorithm_combo.currentTextChanged.connect(self.handle_algorithm_change)
         controls_layout.addWidget(self.algorithm_combo)
 
         # Page Replacement Algorithm
         self.page_algorithm_combo = QComboBox()
-        self.page_algorithm_combo.addItems(["None", "FIFO", "LRU", "LFU"])
+        self.page_algorithm_combo.addItems(["None", *MemoryManager.PAGE_REPLACEMENT_ALGORITHMS])
         self.page_algorithm_combo.currentTextChanged.connect(self.handle_page_algorithm_change)
         controls_layout.addWidget(self.page_algorithm_combo)
 
@@ -87,8 +88,17 @@ class MemoryVisualizerApp(QMainWindow):
         self.metrics_label = QLabel()
         main_layout.addWidget(self.metrics_label)
 
+    def on_tick(self):
+        self._tick += 1
+        self.update_visualization()
+        if self._tick % self._graph_ticks == 0:
+            self.update_graph()
+
     def update_visualization(self):
-        self.memory_vis.update_blocks()
+        if self.memory_manager.version == self._last_version:
+            return
+        self._last_version = self.memory_manager.version
+        self.memory_vis.update()
         self.update_metrics()
 
     def update_graph(self):
@@ -98,8 +108,12 @@ class MemoryVisualizerApp(QMainWindow):
         try:
             size = int(self.size_input.text())
             process_id = int(self.process_id_input.text())
-            start = self.memory_manager.allocate(size, process_id)
-            if start is not None:
+            if size <= 0:
+                self.show_message("Allocation size must be positive.", QMessageBox.Icon.Warning)
+            elif not MIN_PROCESS_ID <= process_id <= MAX_PROCESS_ID:
+                self.show_message(f"Process ID must be between {MIN_PROCESS_ID} and {MAX_PROCESS_ID}.",
+                                  QMessageBox.Icon.Warning)
+            elif (start := self.memory_manager.allocate(size, process_id)) is not None:
                 self.show_message(f"Allocated {size}MB for process {process_id} at position {start}")
             else:
                 self.show_message("Allocation failed: Not enough memory", QMessageBox.Icon.Warning)
@@ -139,25 +153,42 @@ class MemoryVisualizerApp(QMainWindow):
                     self.show_message(f"Simulated {num_allocations} allocations")
 
     def save_state(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Memory State", "", "JSON Files (*.json)")
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Save Memory State", "",
+                                                                "Memory State (*.npz);;JSON Files (*.json)")
         if filename:
-            state = self.memory_manager.get_memory_state()
-            with open(filename, 'w') as f:
-                json.dump(state, f)
+            # An explicit extension wins; otherwise the chosen filter decides the format
+            suffix = os.path.splitext(filename)[1].lower()
+            if suffix not in (".json", ".npz"):
+                suffix = ".json" if selected_filter.startswith("JSON") else ".npz"
+                filename += suffix
+            if suffix == ".json":
+                state = self.memory_manager.get_memory_state()
+                with open(filename, 'w') as f:
+                    json.dump(state, f)
+            else:
+                starts, sizes, is_free, process_ids = self.memory_manager.get_memory_arrays()
+                np.savez_compressed(filename, starts=starts, sizes=sizes, is_free=is_free, process_ids=process_ids)
             self.show_message(f"Memory state saved to {filename}")
 
     def load_state(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Load Memory State", "", "JSON Files (*.json)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Memory State", "",
+                                                  "Memory State (*.npz *.json);;All Files (*)")
         if filename:
-            with open(filename, 'r') as f:
-                state = json.load(f)
-            self.memory_manager.set_memory_state(state)
+            try:
+                # JSON files from earlier versions are still accepted
+                if filename.lower().endswith(".json"):
+                    with open(filename, 'r') as f:
+                        state = json.load(f)
+                    self.memory_manager.set_memory_state(state)
+                else:
+                    with np.load(filename) as data:
+                        self.memory_manager.set_memory_state_arrays(data["starts"], data["sizes"], data["is_free"],
+                                                                    data["process_ids"])
+            except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+                self.show_message(f"Could not load memory state from {filename}: {e}", QMessageBox.Icon.Warning)
+                return
             self.show_message(f"Memory state loaded from {filename}")
 
-    def update_visualization(self):
-        self.memory_vis.update()
-        self.update_metrics()
-
     def update_metrics(self):
         self.metrics_tracker.update()
         metrics_text = f"""
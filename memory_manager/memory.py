@@ -1,40 +1,92 @@
 import time
-from typing import List, Optional, Tuple
-import random
-from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import heapq
+import itertools
+import numpy as np
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from operator import attrgetter
+from sortedcontainers import SortedKeyList
+
+QUICK_FIT_MAX_SIZE = 32  # in MB, largest size kept in the exact-size free lists
+# Process ids must fit the int64 array returned by MemoryManager.get_memory_arrays()
+MIN_PROCESS_ID = int(np.iinfo(np.int64).min)
+MAX_PROCESS_ID = int(np.iinfo(np.int64).max)
 
 class MemoryBlock:
+    __slots__ = ("start", "size", "is_free", "process_id", "timestamp", "access_count")
+
     def __init__(self, start: int, size: int, is_free: bool = True, process_id: Optional[int] = None):
         self.start = start
         self.size = size
         self.is_free = is_free
         self.process_id = process_id
-        self.timestamp = time.time()  # Track when the block was allocated
+        self.timestamp = time.monotonic_ns()  # Track when the block was allocated (ordering only)
         self.access_count = 0  # Track how many times the block was accessed
 
 class MemoryManager:
+    ALLOCATION_ALGORITHMS = ("First Fit", "Best Fit", "Worst Fit", "Next Fit", "Quick Fit")
+    PAGE_REPLACEMENT_ALGORITHMS = ("FIFO", "LRU", "LFU")
+
     def __init__(self, total_size: int):
         self.total_size = total_size
         self.blocks: List[MemoryBlock] = [MemoryBlock(0, total_size)]
+        # Free blocks indexed by (size, start) for best/worst fit and by start for address order
+        self._free_by_size = SortedKeyList(key=lambda b: (b.size, b.start))
+        self._free_by_addr = SortedKeyList(key=attrgetter('start'))
+        # Quick-fit: exact-size free lists for small blocks
+        self._size_buckets: Dict[int, Deque[MemoryBlock]] = {}
+        self._rebuild_free_index()
         self.algorithm = "First Fit"
+        # Fit routine per algorithm name, so allocate() doesn't rebuild the method name each call
+        self._allocators = {
+            "First Fit": self._first_fit,
+            "Best Fit": self._best_fit,
+            "Worst Fit": self._worst_fit,
+            "Next Fit": self._next_fit,
+            "Quick Fit": self._quick_fit,
+        }
+        self._alloc_fn = self._allocators[self.algorithm]
         self.page_replacement_algorithm = "FIFO"  # Default page replacement algorithm
         self.failed_allocations = 0
         self.total_allocations = 0
-        self.allocation_history = []
+        self.allocation_history = deque(maxlen=10_000)  # Most recent successful allocations
+        # Running totals over every successful allocation, so the average stays O(1)
+        self._alloc_time_sum = 0.0
+        self._alloc_time_count = 0
         self.compaction_count = 0
-        self.replacement_queue = deque()  # For FIFO and LRU tracking
+        self.allocated_memory = 0  # Running total of allocated sizes, kept in step with self.blocks
+        self.replacement_queue = deque()  # For FIFO tracking
+        # Allocated blocks from least to most recently used, for LRU
+        self._lru: "OrderedDict[MemoryBlock, None]" = OrderedDict()
+        # (access_count, start, seq, block) entries for LFU, so ties go to the lowest address;
+        # stale entries are skipped when popped
+        self._lfu_heap: List[Tuple[int, int, int, MemoryBlock]] = []
+        self._lfu_seq = itertools.count()
+        self._next_fit_start = 0  # Address where the next Next Fit scan starts
+        self.version = 0  # Bumped on every state change so views can skip redundant redraws
+        # Struct-of-arrays snapshot of self.blocks, rebuilt lazily when the version changes
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        self._arrays_version = -1
 
     def allocate(self, size: int, process_id: int) -> Optional[int]:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         self.total_allocations += 1
-        allocation_func = getattr(self, f"_{self.algorithm.lower().replace(' ', '_')}")
-        result = allocation_func(size, process_id)
+        self.version += 1
+        if size <= 0 or not MIN_PROCESS_ID <= process_id <= MAX_PROCESS_ID:
+            # A zero-size block would share its start with the next block and break _block_index
+            self.failed_allocations += 1
+            return None
+        result = self._alloc_fn(size, process_id)
         if result is None:
             self.failed_allocations += 1
             # Invoke page replacement if allocation fails due to memory shortage
             result = self.page_replace(size, process_id)
         else:
-            self.allocation_history.append((process_id, size, start_time, time.time() - start_time))
+            elapsed = (time.perf_counter_ns() - start_ns) * 1e-9
+            self.allocation_history.append((process_id, size, start_ns, elapsed))
+            self._alloc_time_sum += elapsed
+            self._alloc_time_count += 1
         return result
 
     def page_replace(self, size: int, process_id: int) -> Optional[int]:
@@ -57,88 +109,117 @@ class MemoryManager:
         return None
 
     def _lru_page_replacement(self, size: int, process_id: int) -> Optional[int]:
-        # LRU removes the least recently used block (smallest timestamp)
-        used_blocks = [block for block in self.blocks if not block.is_free]
-        if not used_blocks:
+        # LRU removes the least recently used block, the oldest entry in self._lru
+        if not self._lru:
             return None
-        least_recently_used = min(used_blocks, key=lambda b: b.timestamp)
+        least_recently_used = next(iter(self._lru))
         self.deallocate(least_recently_used.start)
         return self.allocate(size, process_id)
 
     def _lfu_page_replacement(self, size: int, process_id: int) -> Optional[int]:
         # LFU removes the least frequently used block
-        used_blocks = [block for block in self.blocks if not block.is_free]
-        if not used_blocks:
-            return None
-        least_frequently_used = min(used_blocks, key=lambda b: b.access_count)
-        self.deallocate(least_frequently_used.start)
-        return self.allocate(size, process_id)
+        while self._lfu_heap:
+            access_count, start, _, block = heapq.heappop(self._lfu_heap)
+            # Entries for blocks freed, reallocated or moved since they were pushed are stale
+            if not block.is_free and block.access_count == access_count and block.start == start:
+                self.deallocate(block.start)
+                return self.allocate(size, process_id)
+        return None
 
     def _first_fit(self, size: int, process_id: int) -> Optional[int]:
-        for i, block in enumerate(self.blocks):
-            if block.is_free and block.size >= size:
-                return self._split_block(i, size, process_id)
+        # Address-ordered first fit over the free blocks only
+        for block in self._free_by_addr:
+            if block.size >= size:
+                return self._split_block(self._block_index(block.start), size, process_id)
         return None
 
+    def _quick_fit(self, size: int, process_id: int) -> Optional[int]:
+        # An exact-size small block needs no split, so take the lowest-addressed one before scanning
+        bucket = self._size_buckets.get(size)
+        if bucket:
+            block = min(bucket, key=attrgetter('start'))
+            return self._split_block(self._block_index(block.start), size, process_id)
+        return self._first_fit(size, process_id)
+
     def _best_fit(self, size: int, process_id: int) -> Optional[int]:
-        best_fit = min((block for block in self.blocks if block.is_free and block.size >= size), 
-                       key=lambda b: b.size, default=None)
-        if best_fit:
-            return self._split_block(self.blocks.index(best_fit), size, process_id)
-        return None
+        # Smallest free block that fits, lowest address on ties
+        idx = self._free_by_size.bisect_key_left((size, 0))
+        if idx == len(self._free_by_size):
+            return None
+        best_fit = self._free_by_size[idx]
+        return self._split_block(self._block_index(best_fit.start), size, process_id)
 
     def _worst_fit(self, size: int, process_id: int) -> Optional[int]:
-        worst_fit = max((block for block in self.blocks if block.is_free and block.size >= size), 
-                        key=lambda b: b.size, default=None)
-        if worst_fit:
-            return self._split_block(self.blocks.index(worst_fit), size, process_id)
-        return None
+        if not self._free_by_size or self._free_by_size[-1].size < size:
+            return None
+        # Largest free block, lowest address on ties
+        idx = self._free_by_size.bisect_key_left((self._free_by_size[-1].size, 0))
+        worst_fit = self._free_by_size[idx]
+        return self._split_block(self._block_index(worst_fit.start), size, process_id)
 
     def _next_fit(self, size: int, process_id: int) -> Optional[int]:
-        start_index = getattr(self, '_last_allocation_index', 0)
-        for i in range(len(self.blocks)):
-            index = (start_index + i) % len(self.blocks)
-            if self.blocks[index].is_free and self.blocks[index].size >= size:
-                self._last_allocation_index = index
-                return self._split_block(index, size, process_id)
+        # Scan free blocks from the last allocation's address, wrapping around once
+        free_blocks = self._free_by_addr
+        rover = free_blocks.bisect_key_left(self._next_fit_start)
+        for block in itertools.chain(free_blocks.islice(rover), free_blocks.islice(0, rover)):
+            if block.size >= size:
+                self._next_fit_start = block.start
+                return self._split_block(self._block_index(block.start), size, process_id)
         return None
 
     def _split_block(self, index: int, size: int, process_id: int) -> int:
         block = self.blocks[index]
+        self._remove_free(block)
         if block.size > size:
             new_block = MemoryBlock(block.start + size, block.size - size)
             self.blocks.insert(index + 1, new_block)
+            self._add_free(new_block)
             block.size = size
+        self.allocated_memory += size
         block.is_free = False
         block.process_id = process_id
-        block.timestamp = time.time()  # Update timestamp for LRU
+        block.timestamp = time.monotonic_ns()  # Update timestamp for LRU
         block.access_count += 1  # Increase access count for LFU
-        self.replacement_queue.append(block)  # Track for FIFO/LRU
+        self.replacement_queue.append(block)  # Track for FIFO
+        self._lru[block] = None
+        heapq.heappush(self._lfu_heap, (block.access_count, block.start, next(self._lfu_seq), block))
+        if len(self._lfu_heap) > 2 * len(self._lru) + 64:
+            self._rebuild_lfu_heap()
         return block.start
 
     def deallocate(self, start: int) -> bool:
-        for i, block in enumerate(self.blocks):
-            if block.start == start and not block.is_free:
-                block.is_free = True
-                block.process_id = None
-                self._merge_free_blocks()
-                return True
-        return False
-
-    def _merge_free_blocks(self) -> None:
-        i = 0
-        while i < len(self.blocks) - 1:
-            if self.blocks[i].is_free and self.blocks[i + 1].is_free:
-                self.blocks[i].size += self.blocks[i + 1].size
-                self.blocks.pop(i + 1)
-            else:
-                i += 1
+        i = self._block_index(start)
+        if i == len(self.blocks) or self.blocks[i].start != start or self.blocks[i].is_free:
+            return False
+        block = self.blocks[i]
+        self.allocated_memory -= block.size
+        block.is_free = True
+        block.process_id = None
+        del self._lru[block]
+        self._merge_free_blocks(i)
+        self.version += 1
+        return True
+
+    def _merge_free_blocks(self, index: int) -> None:
+        """ Coalesces the just-freed block at index with its free neighbours and indexes the result. """
+        block = self.blocks[index]
+        # Free blocks are always coalesced, so only the two neighbours can need merging
+        if index + 1 < len(self.blocks) and self.blocks[index + 1].is_free:
+            next_block = self.blocks.pop(index + 1)
+            self._remove_free(next_block)
+            block.size += next_block.size
+        if index > 0 and self.blocks[index - 1].is_free:
+            prev_block = self.blocks[index - 1]
+            self._remove_free(prev_block)
+            prev_block.size += block.size
+            del self.blocks[index]
+            block = prev_block
+        self._add_free(block)
 
     def compact_memory(self) -> None:
+        # self.blocks is kept in address order, so no sort is needed
         allocated_blocks = [b for b in self.blocks if not b.is_free]
-        free_space = sum(b.size for b in self.blocks if b.is_free)
-
-        allocated_blocks.sort(key=lambda b: b.start)
+        free_space = self.total_size - self.allocated_memory
 
         current_position = 0
         for block in allocated_blocks:
@@ -149,13 +230,58 @@ class MemoryManager:
             allocated_blocks.append(MemoryBlock(current_position, free_space, is_free=True))
 
         self.blocks = allocated_blocks
+        self._rebuild_free_index()
+        # Compaction moved the allocated blocks, so re-key their LFU entries by the new starts
+        self._rebuild_lfu_heap()
         self.compaction_count += 1
+        self.version += 1
 
-    def get_fragmentation_ratio(self) -> float:
+    def _block_index(self, start: int) -> int:
+        """ Returns the position in self.blocks of the block beginning at start. """
+        return bisect_left(self.blocks, start, key=attrgetter('start'))
+
+    def _add_free(self, block: MemoryBlock) -> None:
+        self._free_by_size.add(block)
+        self._free_by_addr.add(block)
+        if block.size <= QUICK_FIT_MAX_SIZE:
+            self._size_buckets.setdefault(block.size, deque()).append(block)
+
+    def _remove_free(self, block: MemoryBlock) -> None:
+        self._free_by_size.remove(block)
+        self._free_by_addr.remove(block)
+        if block.size <= QUICK_FIT_MAX_SIZE:
+            bucket = self._size_buckets[block.size]
+            bucket.remove(block)
+            if not bucket:
+                del self._size_buckets[block.size]
+
+    def _rebuild_lfu_heap(self) -> None:
+        """ Drops stale LFU entries by rebuilding the heap from the allocated blocks. """
+        self._lfu_heap = [(b.access_count, b.start, next(self._lfu_seq), b) for b in self._lru]
+        heapq.heapify(self._lfu_heap)
+
+    def _rebuild_free_index(self) -> None:
         free_blocks = [b for b in self.blocks if b.is_free]
-        if not free_blocks:
+        self._free_by_size.clear()
+        self._free_by_size.update(free_blocks)
+        self._free_by_addr.clear()
+        self._free_by_addr.update(free_blocks)
+        self._size_buckets.clear()
+        for block in free_blocks:
+            if block.size <= QUICK_FIT_MAX_SIZE:
+                self._size_buckets.setdefault(block.size, deque()).append(block)
+
+    def get_fragmentation_ratio(self) -> float:
+        free_count = len(self._free_by_addr)
+        if not free_count:
             return 0
-        return (len(free_blocks) - 1) / len(free_blocks)
+        return (free_count - 1) / free_count
+
+    def get_free_block_count(self) -> int:
+        return len(self._free_by_addr)
+
+    def get_largest_free_block(self) -> int:
+        return self._free_by_size[-1].size if self._free_by_size else 0
 
     def get_allocation_success_rate(self) -> float:
         if self.total_allocations == 0:
@@ -163,29 +289,84 @@ class MemoryManager:
         return (self.total_allocations - self.failed_allocations) / self.total_allocations
 
     def get_average_allocation_time(self) -> float:
-        if not self.allocation_history:
+        if not self._alloc_time_count:
             return 0
-        return sum(alloc[3] for alloc in self.allocation_history) / len(self.allocation_history)
+        return self._alloc_time_sum / self._alloc_time_count
 
     def simulate_allocations(self, num_allocations: int, min_size: int, max_size: int) -> None:
-        for _ in range(num_allocations):
-            size = random.randint(min_size, max_size)
-            process_id = random.randint(1, 1000)
+        rng = np.random.default_rng()
+        sizes = rng.integers(min_size, max_size, size=num_allocations, endpoint=True)
+        process_ids = rng.integers(1, 1000, size=num_allocations, endpoint=True)
+        # tolist() hands allocate plain ints rather than NumPy scalars
+        for size, process_id in zip(sizes.tolist(), process_ids.tolist()):
             self.allocate(size, process_id)
 
     def get_memory_state(self) -> List[Tuple[int, int, bool, Optional[int]]]:
         return [(b.start, b.size, b.is_free, b.process_id) for b in self.blocks]
 
     def set_memory_state(self, state: List[Tuple[int, int, bool, Optional[int]]]) -> None:
-        self.blocks = [MemoryBlock(start, size, is_free, process_id) for start, size, is_free, process_id in state]
+        """ Loads a layout in the format returned by get_memory_state(); raises ValueError if it is invalid. """
+        blocks: List[MemoryBlock] = []
+        position = 0
+        for start, size, is_free, process_id in state:
+            if start != position:
+                raise ValueError(f"Invalid memory state: block at {start} should start at {position}")
+            if size < 0:
+                raise ValueError(f"Invalid memory state: block at {start} has negative size {size}")
+            if not is_free and not MIN_PROCESS_ID <= process_id <= MAX_PROCESS_ID:
+                raise ValueError(f"Invalid memory state: process id {process_id} at {start} is out of range")
+            position += size
+            if size == 0:
+                # Older versions allowed zero-size blocks, which share a start with their neighbour
+                continue
+            if is_free and blocks and blocks[-1].is_free:
+                blocks[-1].size += size
+                continue
+            blocks.append(MemoryBlock(start, size, is_free, None if is_free else process_id))
+        if position != self.total_size:
+            raise ValueError(f"Invalid memory state: blocks cover {position}MB of {self.total_size}MB")
+
+        self.blocks = blocks
+        self._rebuild_free_index()
+        allocated_blocks = [b for b in self.blocks if not b.is_free]
+        self.allocated_memory = sum(b.size for b in allocated_blocks)
+        # The old blocks are gone, so replacement tracking restarts from the loaded ones
+        self.replacement_queue = deque(allocated_blocks)
+        self._lru = OrderedDict.fromkeys(allocated_blocks)
+        self._rebuild_lfu_heap()
+        self.version += 1
+
+    def set_memory_state_arrays(self, starts: np.ndarray, sizes: np.ndarray, is_free: np.ndarray,
+                                process_ids: np.ndarray) -> None:
+        """ Loads a layout in the format returned by get_memory_arrays(). """
+        self.set_memory_state([(start, size, free, None if free else process_id)
+                               for start, size, free, process_id in zip(starts.tolist(), sizes.tolist(),
+                                                                         is_free.tolist(), process_ids.tolist())])
 
     def set_algorithm(self, algorithm: str) -> None:
-        if algorithm in ["First Fit", "Best Fit", "Worst Fit", "Next Fit"]:
+        if algorithm in self.ALLOCATION_ALGORITHMS:
             self.algorithm = algorithm
+            self._alloc_fn = self._allocators[algorithm]
+            self.version += 1
 
     def set_page_replacement_algorithm(self, algorithm: str) -> None:
-        if algorithm in ["FIFO", "LRU", "LFU"]:
+        if algorithm in self.PAGE_REPLACEMENT_ALGORITHMS:
             self.page_replacement_algorithm = algorithm
+            self.version += 1
+
+    def get_memory_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """ Returns read-only (starts, sizes, is_free, process_ids) arrays, process id -1 for free blocks. """
+        if self._arrays_version != self.version:
+            count = len(self.blocks)
+            starts = np.fromiter((b.start for b in self.blocks), dtype=np.int64, count=count)
+            sizes = np.fromiter((b.size for b in self.blocks), dtype=np.int64, count=count)
+            is_free = np.fromiter((b.is_free for b in self.blocks), dtype=np.bool_, count=count)
+            pids = np.fromiter((-1 if b.is_free else b.process_id for b in self.blocks), dtype=np.int64, count=count)
+            for array in (starts, sizes, is_free, pids):
+                array.flags.writeable = False
+            self._arrays = (starts, sizes, is_free, pids)
+            self._arrays_version = self.version
+        return self._arrays
 
     def get_blocks(self) -> List[MemoryBlock]:
         """ Returns the current list of memory blocks. """
@@ -4,15 +4,18 @@ class MetricsTracker:
         self.fragmentation = 0
         self.allocated_memory = 0
         self.largest_free_block = 0
+        self._last_version = -1
 
     def update(self):
-        blocks = self.memory_manager.get_blocks()
-        free_blocks = [block for block in blocks if block.is_free]
-        allocated_blocks = [block for block in blocks if not block.is_free]
+        # The memory manager keeps these incrementally; skip entirely if nothing changed
+        if self.memory_manager.version == self._last_version:
+            return
+        self._last_version = self.memory_manager.version
 
-        self.fragmentation = len(free_blocks) - 1 if free_blocks else 0
-        self.allocated_memory = sum(block.size for block in allocated_blocks)
-        self.largest_free_block = max((block.size for block in free_blocks), default=0)
+        free_count = self.memory_manager.get_free_block_count()
+        self.fragmentation = free_count - 1 if free_count else 0
+        self.allocated_memory = self.memory_manager.allocated_memory
+        self.largest_free_block = self.memory_manager.get_largest_free_block()
 
     def get_fragmentation(self):
         return self.fragmentation
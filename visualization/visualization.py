@@ -1,6 +1,9 @@
+from collections import deque
+from typing import Optional
+import numpy as np
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QPainterPath
-from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QPixmap, QPolygonF
+from PyQt6.QtCore import Qt, QPointF, QRectF
 import config
 
 class MemoryVisualization(QWidget):
@@ -8,39 +11,86 @@ class MemoryVisualization(QWidget):
         super().__init__()
         self.memory_manager = memory_manager
         self.setMinimumSize(config.MEMORY_RECT_WIDTH + 100, config.MEMORY_RECT_HEIGHT + 200)
-        self.usage_history = []
+        self.usage_history = deque(maxlen=1000)  # Keep only the last 1000 points
+
+        self._free_color = QColor(config.COLOR_FREE_MEMORY)
+        self._text_color = QColor(config.COLOR_TEXT)
+        self._block_font = QFont("Arial", 8)
+        self._pid_color = {}  # process_id -> QColor, filled on first use
+
+        # Rendered memory bar, reused until the memory manager's version or the screen's DPI changes
+        self._cached_pixmap: Optional[QPixmap] = None
+        self._cached_version = -1
+        self._cached_ratio = 0.0
 
     def paintEvent(self, event):
+        ratio = self.devicePixelRatioF()
+        if (self._cached_pixmap is None or self._cached_version != self.memory_manager.version
+                or self._cached_ratio != ratio):
+            self._cached_pixmap = self.render_memory_blocks()
+            self._cached_version = self.memory_manager.version
+            self._cached_ratio = ratio
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        self.draw_memory_blocks(painter)
+        painter.drawPixmap(config.MEMORY_RECT_X, config.MEMORY_RECT_Y, self._cached_pixmap)
         self.draw_usage_history(painter)
 
+    def render_memory_blocks(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(config.MEMORY_RECT_WIDTH * ratio), int(config.MEMORY_RECT_HEIGHT * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        # No antialiasing: adjacent blocks share fractional edges and would show seams
+        painter = QPainter(pixmap)
+        self.draw_memory_blocks(painter)
+        painter.end()
+        return pixmap
+
     def draw_memory_blocks(self, painter):
-        blocks = self.memory_manager.get_blocks()
-        total_memory = self.memory_manager.total_size
-        
-        for block in blocks:
-            x = config.MEMORY_RECT_X + (block.start / total_memory) * config.MEMORY_RECT_WIDTH
-            width = (block.size / total_memory) * config.MEMORY_RECT_WIDTH
-            
-            if block.is_free:
-                color = QColor(config.COLOR_FREE_MEMORY)
-            else:
-                # Use a hash of the process_id to generate a unique color
-                color = QColor(hash(block.process_id) % 256, hash(block.process_id * 2) % 256, hash(block.process_id * 3) % 256)
-            
-            painter.fillRect(QRectF(x, config.MEMORY_RECT_Y, width, config.MEMORY_RECT_HEIGHT), color)
-            
-            # Draw block size and process id text
-            painter.setPen(QColor(config.COLOR_TEXT))
-            painter.setFont(QFont("Arial", 8))
-            size_text = f"{block.size}MB"
-            if not block.is_free:
-                size_text += f"\nPID: {block.process_id}"
-            painter.drawText(QRectF(x, config.MEMORY_RECT_Y, width, config.MEMORY_RECT_HEIGHT), 
-                             Qt.AlignmentFlag.AlignCenter, size_text)
+        # Draws in pixmap coordinates: the memory bar's top-left corner is (0, 0)
+        starts, sizes, is_free, process_ids = self.memory_manager.get_memory_arrays()
+        scale = config.MEMORY_RECT_WIDTH / self.memory_manager.total_size
+
+        xs = starts * scale
+        widths = sizes * scale
+        rects = [QRectF(x, 0, width, config.MEMORY_RECT_HEIGHT) for x, width in zip(xs.tolist(), widths.tolist())]
+
+        # Group rectangles by fill color so each brush is set once
+        free_rects = [rects[i] for i in np.flatnonzero(is_free).tolist()]
+        rects_by_pid = {}
+        allocated = np.flatnonzero(~is_free)
+        for i, process_id in zip(allocated.tolist(), process_ids[allocated].tolist()):
+            rects_by_pid.setdefault(process_id, []).append(rects[i])
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._free_color)
+        painter.drawRects(free_rects)
+        for process_id, pid_rects in rects_by_pid.items():
+            painter.setBrush(self._color_for_pid(process_id))
+            painter.drawRects(pid_rects)
+
+        # Draw block size and process id text, skipping blocks too narrow to show it
+        painter.setPen(self._text_color)
+        painter.setFont(self._block_font)
+        labelled = np.flatnonzero(widths >= config.BLOCK_LABEL_MIN_WIDTH)
+        for i, size, free, process_id in zip(labelled.tolist(), sizes[labelled].tolist(),
+                                             is_free[labelled].tolist(), process_ids[labelled].tolist()):
+            size_text = f"{size}MB"
+            if not free:
+                size_text += f"\nPID: {process_id}"
+            painter.drawText(rects[i], Qt.AlignmentFlag.AlignCenter, size_text)
+
+    def _color_for_pid(self, process_id):
+        color = self._pid_color.get(process_id)
+        if color is None:
+            # Scramble a single hash of the process_id and take three of its bytes as RGB
+            h = hash(process_id) * 0x9E3779B1
+            color = QColor((h >> 8) & 0xFF, (h >> 16) & 0xFF, (h >> 24) & 0xFF)
+            self._pid_color[process_id] = color
+        return color
 
     def draw_usage_history(self, painter):
         if not self.usage_history:
@@ -57,34 +107,20 @@ class MemoryVisualization(QWidget):
         painter.drawLine(chart_x, chart_y + chart_height, chart_x + chart_width, chart_y + chart_height)
         painter.drawLine(chart_x, chart_y, chart_x, chart_y + chart_height)
 
-        # Create QPainterPath for the history line
-        path = QPainterPath()
-
-        # Draw usage history
+        # Downsample usage history to at most max_points
+        history = np.fromiter(self.usage_history, dtype=np.float64, count=len(self.usage_history))
         max_points = 100
-        step = max(1, len(self.usage_history) // max_points)
-        points = self.usage_history[-max_points*step::step]
-        
-        for i, usage in enumerate(points):
-            x = chart_x + (i / len(points)) * chart_width
-            y = chart_y + chart_height - (usage / 100) * chart_height
-            if i == 0:
-                path.moveTo(x, y)  # Use moveTo on the path
-            else:
-                path.lineTo(x, y)  # Use lineTo on the path
-
-        # Draw the path
-        painter.drawPath(path)
-
-    def update_blocks(self):
-        self.repaint()
+        step = max(1, len(history) // max_points)
+        points = history[-max_points*step::step]
+
+        xs = chart_x + np.arange(len(points)) * (chart_width / len(points))
+        ys = chart_y + chart_height - (points / 100) * chart_height
+
+        # Draw the history line in a single call
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
 
     def update_graph(self):
-        allocated_memory = sum(block.size for block in self.memory_manager.get_blocks() if not block.is_free)
-        usage_percentage = (allocated_memory / self.memory_manager.total_size) * 100
+        usage_percentage = (self.memory_manager.allocated_memory / self.memory_manager.total_size) * 100
         self.usage_history.append(usage_percentage)
         
-        # Keep only the last 1000 points
-        self.usage_history = self.usage_history[-1000:]
-        
         self.repaint()